@@ -1,4 +1,7 @@
+import os
 import re
+import tempfile
+from typing import BinaryIO
 
 NUMS = {
     'one': 1,
@@ -14,6 +17,8 @@ NUMS = {
 
 INT_MATCH = re.compile('[1-9]')
 
+TAIL_SIZE = 64
+
 
 def get_data(file: str) -> list[str]:
     with open(f'data/{file}', 'r') as f:
@@ -48,7 +53,109 @@ def solve_part_2(file: str) -> int:
     return sum(vals)
 
 
+class CalibrationFollower:
+    """
+    Follows an append-only calibration document and keeps running sums for both parts. Each call to update only
+    reads the complete lines appended since the last call. If the file is replaced, or the bytes just before the
+    checkpoint no longer match what was read (it was truncated and rewritten), the sums are rebuilt from the start.
+    """
+
+    def __init__(self, file: str) -> None:
+        self.path = f'data/{file}'
+        self.offset = 0
+        self.file_id: tuple[int, int] | None = None
+        # Last few bytes read before offset, used to spot a file that was truncated and then grew again
+        self.tail = b''
+        self.part_1 = 0
+        self.part_2 = 0
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.tail = b''
+        self.part_1 = 0
+        self.part_2 = 0
+
+    def _checkpoint_matches(self, f: BinaryIO, size: int) -> bool:
+        if size < self.offset:
+            return False
+        f.seek(self.offset - len(self.tail))
+        return f.read(len(self.tail)) == self.tail
+
+    def update(self) -> tuple[int, int]:
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id != self.file_id or not self._checkpoint_matches(f, stat.st_size):
+                self._reset()
+                self.file_id = file_id
+
+            f.seek(self.offset)
+            data = f.read()
+
+        # Leave any partially written last line for the next call
+        end = data.rfind(b'\n') + 1
+        part_1 = 0
+        part_2 = 0
+        for line in data[:end].decode().splitlines():
+            if not line:
+                continue
+            # Part 2 style lines may only spell out their digits
+            if INT_MATCH.search(line):
+                part_1 += process_line_regex(line)
+            part_2 += process_line_literals(line)
+
+        # Only move the checkpoint once every new line has been processed
+        self.part_1 += part_1
+        self.part_2 += part_2
+        self.offset += end
+        self.tail = (self.tail + data[:end])[-TAIL_SIZE:]
+
+        return self.part_1, self.part_2
+
+
+def check_calibration_follower() -> None:
+    fd, path = tempfile.mkstemp(dir='data', suffix='.txt')
+    os.close(fd)
+    try:
+        follower = CalibrationFollower(os.path.basename(path))
+        assert follower.update() == (0, 0)
+
+        # Appended lines are picked up, a partial line waits for its newline
+        with open(path, 'a') as f:
+            f.write('1abc2\npqr3stu8vwx\ntwo1ni')
+        assert follower.update() == (50, 50)
+        with open(path, 'a') as f:
+            f.write('ne\n')
+        assert follower.update() == (61, 79)
+
+        # A bad line leaves the checkpoint where it was
+        with open(path, 'a') as f:
+            f.write('22\nxyz\n')
+        try:
+            follower.update()
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('Line without digits should fail')
+        assert (follower.part_1, follower.part_2) == (61, 79)
+
+        # Truncated and rewritten past the old offset
+        with open(path, 'w') as f:
+            f.write('11\n' * 30)
+        assert follower.update() == (330, 330)
+
+        # Rotated to a new file
+        with open(f'{path}.new', 'w') as f:
+            f.write('7\n')
+        os.replace(f'{path}.new', path)
+        assert follower.update() == (77, 77)
+    finally:
+        os.remove(path)
+
+
 def main() -> None:
+    check_calibration_follower()
+
     assert solve_part_1('day1-part1-test.txt') == 142
     # 55712
     print('Part 1:', solve_part_1('day1-actual.txt'))
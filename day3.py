@@ -113,7 +113,7 @@ def find_part_numbers(schematic: Schematic, symbol_locations: SymbolLocations) -
             allowed_directions.pop(1, None)
             allowed_directions.pop(2, None)
         # If symbol in bottom row exclude searching below
-        elif row == num_schematic_rows - 1:
+        if row == num_schematic_rows - 1:
             allowed_directions.pop(5, None)
             allowed_directions.pop(6, None)
             allowed_directions.pop(7, None)
@@ -124,7 +124,7 @@ def find_part_numbers(schematic: Schematic, symbol_locations: SymbolLocations) -
             allowed_directions.pop(3, None)
             allowed_directions.pop(5, None)
         # If symbol on right col, only search to the left
-        elif col == num_schematic_cols - 1:
+        if col == num_schematic_cols - 1:
             allowed_directions.pop(2, None)
             allowed_directions.pop(4, None)
             allowed_directions.pop(7, None)
@@ -169,11 +169,252 @@ def map_part_numbers(schematic: Schematic) -> tuple[Schematic, dict[int, int]]:
                     current_number = None
                 new_row.append(item)
 
+        # Numbers never wrap onto the next row
+        if current_number is not None:
+            part_number_map[current_part_number] = int(''.join(current_number))
+            current_part_number += 1
+            current_number = None
+
         new_schematic.append(new_row)
 
     return new_schematic, part_number_map
 
 
+def _is_symbol(item: SchematicItem) -> bool:
+    return item in (GENERAL_SYMBOL, GEAR_SYMBOL)
+
+
+def _is_digit(item: SchematicItem) -> bool:
+    return item is not None and not _is_symbol(item)
+
+
+class IncrementalSchematic:
+    """
+    Keeps a schematic in memory and maintains the part number sum and gear ratio sum as single cells are edited.
+    An edit only rescans the number spans on the edited row that touch the cell, plus the numbers and gears within
+    one cell of it, so the cost of an edit does not depend on the size of the grid.
+    """
+
+    def __init__(self, schematic: Schematic) -> None:
+        self.schematic = [list(row) for row in schematic]
+        self.num_rows = len(self.schematic)
+        self.num_cols = len(self.schematic[0]) if self.schematic else 0
+
+        # Part number id for every digit cell, and (row, start col, end col, value) for every id
+        self._cell_ids: list[list[int | None]] = [[None] * self.num_cols for _ in range(self.num_rows)]
+        self._numbers: dict[int, tuple[int, int, int, int]] = {}
+        self._next_id = 0
+
+        self._part_ids: set[int] = set()
+        self._gear_ratios: dict[tuple[int, int], int] = {}
+        self.part_number_sum = 0
+        self.gear_ratio_sum = 0
+
+        for row in range(self.num_rows):
+            col = 0
+            while col < self.num_cols:
+                if _is_digit(self.schematic[row][col]):
+                    col = self._add_number(row, col) + 1
+                else:
+                    col += 1
+
+        for number_id in self._numbers:
+            self._refresh_number(number_id)
+        for row in range(self.num_rows):
+            for col in range(self.num_cols):
+                if self.schematic[row][col] == GEAR_SYMBOL:
+                    self._refresh_gear(row, col)
+
+    def _neighbours(self, row: int, col: int) -> list[tuple[int, int]]:
+        return [
+            (row + d_row, col + d_col)
+            for d_row, d_col in DIRECTION_MAP.values()
+            if 0 <= row + d_row < self.num_rows and 0 <= col + d_col < self.num_cols
+        ]
+
+    def _add_number(self, row: int, col: int) -> int:
+        """
+        Registers the number whose digits include `col` and returns the column of its last digit
+        """
+        start = col
+        while start > 0 and _is_digit(self.schematic[row][start - 1]):
+            start -= 1
+        end = col
+        while end < self.num_cols - 1 and _is_digit(self.schematic[row][end + 1]):
+            end += 1
+
+        number_id = self._next_id
+        self._next_id += 1
+        value = int(''.join(str(item) for item in self.schematic[row][start:end + 1]))
+        self._numbers[number_id] = (row, start, end, value)
+        for i in range(start, end + 1):
+            self._cell_ids[row][i] = number_id
+
+        return end
+
+    def _remove_number(self, number_id: int) -> None:
+        row, start, end, _ = self._numbers.pop(number_id)
+        for i in range(start, end + 1):
+            self._cell_ids[row][i] = None
+
+    def _numbers_near(self, row: int, col: int) -> set[int]:
+        number_ids = set()
+        for r, c in [(row, col)] + self._neighbours(row, col):
+            if self._cell_ids[r][c] is not None:
+                number_ids.add(self._cell_ids[r][c])
+
+        return number_ids
+
+    def _gears_near(self, number_ids: set[int]) -> set[tuple[int, int]]:
+        gears = set()
+        for number_id in number_ids:
+            row, start, end, _ = self._numbers[number_id]
+            for col in range(start, end + 1):
+                for r, c in self._neighbours(row, col):
+                    if self.schematic[r][c] == GEAR_SYMBOL:
+                        gears.add((r, c))
+
+        return gears
+
+    def _refresh_number(self, number_id: int) -> None:
+        row, start, end, value = self._numbers[number_id]
+        for col in range(start, end + 1):
+            if any(_is_symbol(self.schematic[r][c]) for r, c in self._neighbours(row, col)):
+                self._part_ids.add(number_id)
+                self.part_number_sum += value
+                return
+
+    def _refresh_gear(self, row: int, col: int) -> None:
+        adjacent_parts = {self._cell_ids[r][c] for r, c in self._neighbours(row, col)} - {None}
+        if len(adjacent_parts) == 2:
+            first, second = adjacent_parts
+            ratio = self._numbers[first][3] * self._numbers[second][3]
+            self._gear_ratios[(row, col)] = ratio
+            self.gear_ratio_sum += ratio
+
+    def set_cell(self, row: int, col: int, ch: str) -> None:
+        if not (0 <= row < self.num_rows and 0 <= col < self.num_cols):
+            raise IndexError(f'Cell ({row}, {col}) is outside the schematic')
+        if len(ch) != 1 or (ch.isnumeric() and ch not in '0123456789'):
+            raise ValueError(f'{ch!r} is not a single schematic character')
+
+        item = handle_schematic_item(ch)
+        if item == self.schematic[row][col]:
+            return
+
+        # Drop the part numbers whose contribution could change, gears are handled once the edit is applied
+        old_numbers = self._numbers_near(row, col)
+        old_gears = self._gears_near(old_numbers)
+        if self.schematic[row][col] == GEAR_SYMBOL:
+            old_gears.add((row, col))
+
+        for number_id in old_numbers:
+            if number_id in self._part_ids:
+                self._part_ids.remove(number_id)
+                self.part_number_sum -= self._numbers[number_id][3]
+
+        # Only numbers on the edited row that touch the cell can be split, merged or changed in value
+        for number_id in old_numbers:
+            if self._numbers[number_id][0] == row:
+                self._remove_number(number_id)
+
+        self.schematic[row][col] = item
+        for c in range(max(col - 1, 0), min(col + 2, self.num_cols)):
+            if _is_digit(self.schematic[row][c]) and self._cell_ids[row][c] is None:
+                self._add_number(row, c)
+
+        # Add back the contributions with the edit applied. A gear touching a new number may not have touched any
+        # of the old ones, so every gear on either side of the edit is dropped and recomputed here
+        new_numbers = self._numbers_near(row, col)
+        gears = self._gears_near(new_numbers) | old_gears
+
+        for number_id in new_numbers:
+            self._refresh_number(number_id)
+        for r, c in gears:
+            self.gear_ratio_sum -= self._gear_ratios.pop((r, c), 0)
+            if self.schematic[r][c] == GEAR_SYMBOL:
+                self._refresh_gear(r, c)
+
+
+class RegionIndex:
+    """
+    Summed-area tables over the mapped schematic so part number and gear ratio totals for any rectangle are O(1).
+    Each part number is anchored at the cell of its first digit and each gear ratio at its * symbol.
+    """
+
+    def __init__(self, schematic: Schematic, part_number_map: dict[int, int], symbol_locations: SymbolLocations) -> None:
+        num_rows = len(schematic)
+        num_cols = len(schematic[0]) if schematic else 0
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        part_values = [[0] * num_cols for _ in range(num_rows)]
+        gear_values = [[0] * num_cols for _ in range(num_rows)]
+
+        part_numbers, _ = find_part_numbers(schematic, symbol_locations)
+        anchored = set()
+        for row, items in enumerate(schematic):
+            for col, item in enumerate(items):
+                if isinstance(item, int) and item not in anchored:
+                    anchored.add(item)
+                    if item in part_numbers:
+                        part_values[row][col] = part_number_map[item]
+
+        for row, col, symbol in symbol_locations:
+            if symbol != GEAR_SYMBOL:
+                continue
+            adjacent_parts = {
+                schematic[row + d_row][col + d_col]
+                for d_row, d_col in DIRECTION_MAP.values()
+                if 0 <= row + d_row < num_rows and 0 <= col + d_col < num_cols
+            }
+            adjacent_parts = {item for item in adjacent_parts if isinstance(item, int)}
+            if len(adjacent_parts) == 2:
+                first, second = adjacent_parts
+                gear_values[row][col] = part_number_map[first] * part_number_map[second]
+
+        self._part_sums = self._summed_area(part_values)
+        self._gear_sums = self._summed_area(gear_values)
+
+    def _summed_area(self, values: list[list[int]]) -> list[list[int]]:
+        sums = [[0] * (self.num_cols + 1) for _ in range(self.num_rows + 1)]
+        for row in range(self.num_rows):
+            row_sum = 0
+            for col in range(self.num_cols):
+                row_sum += values[row][col]
+                sums[row + 1][col + 1] = sums[row][col + 1] + row_sum
+
+        return sums
+
+    @staticmethod
+    def _rect_sum(sums: list[list[int]], top: int, left: int, bottom: int, right: int) -> int:
+        return sums[bottom][right] - sums[top][right] - sums[bottom][left] + sums[top][left]
+
+    def query(self, top: int, left: int, bottom: int, right: int) -> tuple[int, int]:
+        """
+        Returns (part number sum, gear ratio sum) for the inclusive rectangle. Bounds are clipped to the schematic
+        """
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom + 1, self.num_rows), min(right + 1, self.num_cols)
+        if top >= bottom or left >= right:
+            return 0, 0
+
+        return (
+            self._rect_sum(self._part_sums, top, left, bottom, right),
+            self._rect_sum(self._gear_sums, top, left, bottom, right),
+        )
+
+    def query_batch(self, rects: list[tuple[int, int, int, int]]) -> list[tuple[int, int]]:
+        return [self.query(*rect) for rect in rects]
+
+
+def get_region_index(file: str) -> RegionIndex:
+    schematic = get_data(file)
+    symbol_locations = get_symbol_locations(schematic)
+    mapped_schematic, part_number_map = map_part_numbers(schematic)
+    return RegionIndex(mapped_schematic, part_number_map, symbol_locations)
+
+
 def solve_part_1(file: str) -> int:
     schematic = get_data(file)
     symbol_locations = get_symbol_locations(schematic)
@@ -191,6 +432,52 @@ def solve_part_2(file: str) -> int:
 
 
 def main() -> None:
+    schematic = IncrementalSchematic(get_data('day3-test.txt'))
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4361, 467835)
+    # Remove and restore a gear
+    schematic.set_cell(1, 3, '.')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (3859, 451490)
+    schematic.set_cell(1, 3, '*')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4361, 467835)
+    # Split 467 into 4 and 7, rejoin it as 497 then change it back to 467
+    schematic.set_cell(0, 1, '.')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (3901, 451735)
+    schematic.set_cell(0, 1, '9')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4391, 468885)
+    schematic.set_cell(0, 1, '6')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4361, 467835)
+    # Merge 664 and 598 into 6641598
+    schematic.set_cell(9, 4, '1')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (6644697, 5014422835)
+    schematic.set_cell(9, 4, '.')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4361, 467835)
+    try:
+        schematic.set_cell(-1, 2, '#')
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('Negative indices should be rejected')
+    for bad_ch in ('12', '', '²'):
+        try:
+            schematic.set_cell(1, 4, bad_ch)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'{bad_ch!r} should be rejected')
+    assert (schematic.part_number_sum, schematic.gear_ratio_sum) == (4361, 467835)
+
+    region_index = get_region_index('day3-test.txt')
+    assert region_index.query(0, 0, 9, 9) == (4361, 467835)
+    assert region_index.query_batch([(0, 0, 4, 4), (5, 5, 9, 9)]) == [(1119, 16345), (1353, 451490)]
+
+    # Numbers ending on the last column, including the very last cell, are their own parts
+    edge_schematic = [list(map(handle_schematic_item, row)) for row in ['.7925', '.#384', '0544#']]
+    edge_index = RegionIndex(*map_part_numbers(edge_schematic), get_symbol_locations(edge_schematic))
+    assert edge_index.query(0, 0, 2, 4) == (8853, 0)
+    edge_schematic = [list(map(handle_schematic_item, row)) for row in ['#67.81', '.52391']]
+    edge_index = RegionIndex(*map_part_numbers(edge_schematic), get_symbol_locations(edge_schematic))
+    assert edge_index.query(0, 0, 1, 5) == (52458, 0)
+
     assert solve_part_1('day3-test.txt') == 4361
     print('Part 1:', solve_part_1('day3-actual.txt'))
 
@@ -50,6 +50,8 @@ Process all of the original and copied scratchcards until no more scratchcards a
 """
 from typing import TypedDict
 
+from tokenizer import parse_ints
+
 
 class CardData(TypedDict):
     winning: set[int]
@@ -58,16 +60,15 @@ class CardData(TypedDict):
 
 def get_data(file: str) -> dict[int, CardData]:
     output = {}
-    with open(f'data/{file}', 'r') as f:
+    with open(f'data/{file}', 'rb') as f:
         lines = f.read().splitlines()
 
     for line in lines:
-        id_part, numbers_part = line.split(': ')
-        card_id = int(id_part.split(' ')[-1])
-        winning_numbers_part, drawn_numbers_part = numbers_part.split(' | ')
+        card_part, drawn_numbers_part = line.split(b'|')
+        card_id, *winning_numbers = parse_ints(card_part)
         output[card_id] = {
-            'winning': set(map(lambda x: int(x.strip()), filter(lambda x: x, winning_numbers_part.split(' ')))),
-            'drawn': set(map(lambda x: int(x.strip()), filter(lambda x: x, drawn_numbers_part.split(' ')))),
+            'winning': set(winning_numbers),
+            'drawn': set(parse_ints(drawn_numbers_part)),
         }
 
     return output
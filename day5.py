@@ -1,3 +1,5 @@
+import os
+import tempfile
 from collections import defaultdict
 from typing import TypedDict
 
@@ -125,6 +127,20 @@ def solve_part2(file: str) -> int:
 
 
 def main() -> None:
+    maps, seeds = get_data('day5-test.txt')
+    assert len(maps) == 7
+    # CRLF line endings and extra blank lines between maps parse the same way
+    with open('data/day5-test.txt', 'rb') as f:
+        test_data = f.read()
+    fd, path = tempfile.mkstemp(dir='data', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(test_data.replace(b'\n\n', b'\n\n\n').replace(b'\n', b'\r\n'))
+        assert get_data(os.path.basename(path)) == (maps, seeds)
+        assert solve_part1(os.path.basename(path)) == 35
+    finally:
+        os.remove(path)
+
     assert solve_part1('day5-test.txt') == 35
     # 107430936
     print('Part 1:', solve_part1('day5-actual.txt'))
@@ -1,6 +1,8 @@
 import math
 import typing as t
 
+from tokenizer import parse_ints
+
 
 class Race(t.TypedDict):
     time: int
@@ -8,11 +10,11 @@ class Race(t.TypedDict):
 
 
 def get_data(file: str) -> list[Race]:
-    with open(f'data/{file}', 'r') as f:
+    with open(f'data/{file}', 'rb') as f:
         lines = f.read().splitlines()
 
-    times = list(map(int, lines[0].split(':')[1].split()))
-    dists = list(map(int, lines[1].split(':')[1].split()))
+    times = parse_ints(lines[0])
+    dists = parse_ints(lines[1])
 
     return [{'time': t, 'dist': d} for t, d in zip(times, dists)]
 
@@ -0,0 +1,17 @@
+import re
+
+INT_TOKEN = re.compile(rb'\d+')
+
+
+def parse_ints(line: bytes) -> list[int]:
+    return list(map(int, INT_TOKEN.findall(line)))
+
+
+def main() -> None:
+    assert parse_ints(b'Card  1: 41 48 | 83  6') == [1, 41, 48, 83, 6]
+    assert parse_ints(b'Time:      7  15   30\r\n') == [7, 15, 30]
+    assert parse_ints(b'') == []
+
+
+if __name__ == '__main__':
+    main()